@@ -4,15 +4,35 @@
 """Required imports"""
 import os
 import sys
+import gc
+import io
+import re
+import csv
 import json
+import mmap
+import time
+import uuid
+import weakref
+import bisect
+import struct
+import heapq
+import functools
+import contextlib
 import random
+import itertools
 import threading
+import tracemalloc
 import tkinter as tk
+from tkinter import filedialog
 from enum import Enum
-from typing import List
+from typing import List, Iterator
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field, asdict, astuple
+from typing import Callable
 import pygame as pg
+import pygame.freetype
 
 # Set working directory to exe/script location so cfg/ writes land next to the exe
 os.chdir(os.path.dirname(os.path.abspath(sys.argv[0])))
@@ -22,16 +42,118 @@ def resource_path(rel: str) -> str:
     base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(sys.argv[0])))
     return os.path.join(base, rel)
 
+class AssetPack:
+    """Read-only indexed archive of media assets, memory-mapped on first use.
+
+    Layout: b"FFPK" magic, u32 table-of-contents length, JSON table of
+    contents mapping "media/..." paths to [offset, size], then the raw
+    uncompressed blobs. Only the table of contents is parsed on open; each
+    blob is sliced out of the mapping the first time it is requested.
+    """
+    MAGIC = b"FFPK"
+    HEADER = struct.Struct("<4sI")
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, toc_len = self.HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"Not an asset pack: {path}")
+        start = self.HEADER.size
+        self.toc: dict[str, list[int]] = json.loads(self._mm[start:start + toc_len])
+        self._base = start + toc_len
+
+    def __contains__(self, rel: str) -> bool:
+        return rel in self.toc
+
+    def open(self, rel: str) -> io.BytesIO:
+        """Return a file-like view of one asset"""
+        offset, size = self.toc[rel]
+        return io.BytesIO(self._mm[self._base + offset:self._base + offset + size])
+
+    def list(self, prefix: str) -> List[str]:
+        """Asset names under a directory prefix"""
+        return [name for name in self.toc if name.startswith(prefix)]
+
+    @classmethod
+    def build(cls, src_dir: str, out_path: str) -> int:
+        """Pack every file under src_dir into out_path. Returns the asset count."""
+        toc, offset = {}, 0
+        files = []
+        for root, _, names in os.walk(src_dir):
+            for name in sorted(names):
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, os.path.dirname(src_dir) or ".").replace(os.sep, "/")
+                size = os.path.getsize(path)
+                toc[rel] = [offset, size]
+                files.append(path)
+                offset += size
+        toc_bytes = json.dumps(toc).encode("utf-8")
+        tmp = out_path + ".tmp"
+        with open(tmp, "wb") as out:
+            out.write(cls.HEADER.pack(cls.MAGIC, len(toc_bytes)))
+            out.write(toc_bytes)
+            for path in files:
+                with open(path, "rb") as f:
+                    out.write(f.read())
+        os.replace(tmp, out_path)
+        return len(toc)
+
+@functools.lru_cache(maxsize=None)
+def _open_pack() -> AssetPack | None:
+    """The asset pack, mapped on first use so --build-pack never runs with it open"""
+    path = resource_path(PACK_NAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        return AssetPack(path)
+    except (OSError, ValueError) as e:
+        print(f"Failed to open asset pack: {e}")
+        return None
+
+def open_asset(rel: str):
+    """Open a bundled asset from the pack if present, else from disk via resource_path. Use as a context manager."""
+    pack = _open_pack()
+    if pack is not None and rel in pack:
+        return pack.open(rel)
+    return open(resource_path(rel), "rb")
+
+def list_assets(prefix: str) -> List[str]:
+    """List bundled assets under a directory prefix (pack or disk)."""
+    pack = _open_pack()
+    if pack is not None:
+        return pack.list(prefix)
+    base = resource_path(prefix)
+    if not os.path.exists(base):
+        return []
+    return [prefix + f for f in os.listdir(base)]
+
 # Config
 APP_TITLE = "Focus Flow - Pomodoro To-Do App"
-APP_ICON = resource_path("media/images/ff.png")
+PACK_NAME = "media.pack"
+APP_ICON = "media/images/ff.png"
 SAVE_PATH = "cfg/state.json"
+JOURNAL_PATH = "cfg/state.journal"
+JOURNAL_COMPACT = 500
+UNDO_LIMIT = 100
 CONFIG_PATH = "cfg/config.json"
 STATS_PATH = "cfg/stats.json"
-SOUND_DIR = resource_path("media/alarms/")
+METRICS_INTERVAL = 15
+TEXT_BACKEND = "sysfont"
+DEVICE_PATH = "cfg/device.json"
+SYNC_STATE_PATH = "cfg/sync_state.json"
+SYNC_INTERVAL = 30
+STATS_SAVE_INTERVAL = 10
+SOUND_DIR = "media/alarms/"
+MEMORY_REPORT_PATH = "cfg/memory_report.txt"
+MEMORY_REPORT_KEEP = 5
+MEMORY_SNAPSHOT_INTERVAL = 10 * 60
+IMPORT_BATCH = 1000
+CHECKLIST_RE = re.compile(r"^\s*[-*+]\s+\[([ xX])\]\s+(.+?)\s*$")
 BASE_W, BASE_H = 560, 720
 FPS = 60
 DEFAULT_POMODORO = 25 * 60
+NOTICE_SECONDS = 8
 
 # Colors
 COLOR_BG = (40, 40, 40)
@@ -74,12 +196,104 @@ class AppMode(Enum):
     INSTRUCTIONS = 3
     STATS = 4
 
-@dataclass
+@dataclass(slots=True)
 class Task:
-    """A task item"""
+    """A task item (slotted: no per-instance __dict__)"""
     text: str
     complete: bool = False
     score: int = 10
+    uid: str = field(default_factory=lambda: uuid.uuid4().hex)
+    due: str = ""       # YYYY-MM-DD, empty for no due date
+    priority: int = 0   # 0 (none) to 3 (high)
+
+@dataclass
+class CycleConfig:
+    """Pomodoro cycle definition (loaded from cfg/config.json)"""
+    long_break_every: int = 4
+    long_break_minutes: int = 30
+
+    @classmethod
+    def from_dict(cls, data) -> "CycleConfig":
+        """Build from the config's "cycle" object, ignoring unknown keys and invalid values"""
+        cycle = cls()
+        if not isinstance(data, dict):
+            return cycle
+        for name in ("long_break_every", "long_break_minutes"):
+            value = data.get(name)
+            if isinstance(value, int) and not isinstance(value, bool) and value >= 1:
+                setattr(cycle, name, value)
+            elif value is not None:
+                print(f"Ignoring invalid cycle.{name}: {value!r}")
+        return cycle
+
+@dataclass(order=True)
+class ScheduledTimer:
+    """A single deadline tracked by the Scheduler"""
+    deadline: float
+    seq: int
+    name: str = field(compare=False)
+    callback: Callable = field(compare=False)
+    interval: float = field(default=0, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+class Scheduler:
+    """Runs many concurrent countdowns from one heap of deadlines.
+
+    Only the earliest deadline is ever inspected per tick, so the cost of a
+    tick scales with the number of timers that fire, not with how many exist.
+    Cancelled timers are dropped lazily when they reach the top of the heap.
+    """
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._heap: List[ScheduledTimer] = []
+        self._seq = itertools.count()
+        self._active: dict[int, ScheduledTimer] = {}
+
+    def add(self, name: str, seconds: float, callback: Callable, repeat: bool = False) -> int:
+        """Schedule callback(timer) after seconds, optionally repeating. Returns a timer id."""
+        seq = next(self._seq)
+        timer = ScheduledTimer(self.clock() + seconds, seq, name, callback, seconds if repeat else 0)
+        heapq.heappush(self._heap, timer)
+        self._active[seq] = timer
+        return seq
+
+    def cancel(self, timer_id: int) -> None:
+        """Cancel a timer (removed from the heap lazily)"""
+        timer = self._active.pop(timer_id, None)
+        if timer is not None:
+            timer.cancelled = True
+
+    def remaining(self, timer_id: int) -> float | None:
+        """Seconds left on a timer, or None if it is no longer active"""
+        timer = self._active.get(timer_id)
+        return None if timer is None else max(0.0, timer.deadline - self.clock())
+
+    def next_deadline(self) -> float | None:
+        """Earliest live deadline, or None when idle"""
+        while self._heap and self._heap[0].cancelled:
+            heapq.heappop(self._heap)
+        return self._heap[0].deadline if self._heap else None
+
+    def run_due(self) -> int:
+        """Fire every timer whose deadline has passed. Returns the number fired."""
+        now = self.clock()
+        fired = 0
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > now:
+                return fired
+            timer = heapq.heappop(self._heap)
+            if timer.interval:
+                # Skip any periods missed while asleep rather than firing them all at once
+                timer.deadline += timer.interval * (int((now - timer.deadline) // timer.interval) + 1)
+                heapq.heappush(self._heap, timer)
+            else:
+                self._active.pop(timer.seq, None)
+            timer.callback(timer)
+            fired += 1
+
+    def __len__(self) -> int:
+        return len(self._active)
 
 class PomodoroTimer:
     """Manages the Pomodoro timer state and logic"""
@@ -92,6 +306,7 @@ class PomodoroTimer:
         self.sessions_completed = 0
         self.custom_break = 5
         self.default_session = DEFAULT_POMODORO
+        self.cycle = CycleConfig()
 
     def start(self) -> None:
         """Start timer"""
@@ -142,8 +357,8 @@ class PomodoroTimer:
     def complete_session(self) -> None:
         """Session completion"""
         self.sessions_completed += 1
-        if self.session_count >= 4:
-            self.total = 30*60
+        if self.session_count >= self.cycle.long_break_every:
+            self.total = self.cycle.long_break_minutes * 60
             self.session_count = 1
         else:
             self.total = self.custom_break * 60
@@ -159,25 +374,656 @@ class PomodoroTimer:
         self.remaining = self.total
         self.running = False
 
+class Histogram:
+    """Fixed-bucket histogram for the metrics exporter"""
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one observation"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Metrics:
+    """In-process app-performance counters; updated on the UI thread, read by MetricsExporter"""
+    def __init__(self):
+        self.frame_seconds = Histogram((0.005, 0.010, 0.017, 0.025, 0.033, 0.050, 0.100, 0.250, 1.0))
+        self.dialog_open_seconds = Histogram((0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+        self.alarm_start_seconds = Histogram((0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+        self.saves = 0
+        self._recent_saves: deque = deque()
+        self._dialog_started = None
+
+    def saved(self) -> None:
+        """Count one persistence write"""
+        self.saves += 1
+        self._recent_saves.append(time.monotonic())
+
+    def saves_last_minute(self) -> int:
+        """Number of writes in the trailing 60 seconds"""
+        cutoff = time.monotonic() - 60
+        while self._recent_saves and self._recent_saves[0] < cutoff:
+            self._recent_saves.popleft()
+        return len(self._recent_saves)
+
+    def dialog_requested(self) -> None:
+        """Mark the moment a dialog was asked for"""
+        self._dialog_started = time.perf_counter()
+
+    def dialog_opened(self) -> None:
+        """Called from the dialog thread once its window is shown"""
+        if self._dialog_started is not None:
+            self.dialog_open_seconds.observe(time.perf_counter() - self._dialog_started)
+            self._dialog_started = None
+
+METRICS = Metrics()
+
+class MetricsExporter:
+    """Writes an OpenMetrics textfile on a background thread (node-exporter textfile style).
+
+    The file is written to a temp name and renamed so collectors never see a
+    partial file; the pygame loop only ever bumps counters.
+    """
+    def __init__(self, path: str, app: "FocusApp", interval: float = METRICS_INTERVAL):
+        self.path = path
+        self.app = app
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+
+    def start(self) -> None:
+        """Begin periodic writes"""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the worker and write one final snapshot"""
+        self._stop.set()
+        self._thread.join(timeout=2)
+        self.write()
+
+    def _worker(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def write(self) -> None:
+        """Atomically replace the metrics file"""
+        try:
+            text = self.render()
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            print(f"Failed to write metrics: {e}")
+
+    def render(self) -> str:
+        """Current metrics in OpenMetrics text format"""
+        stats, timer = self.app.stats.stats, self.app.timer
+        out = []
+
+        def metric(name, kind, help_text, value, suffix=""):
+            out.extend((f"# TYPE {name} {kind}", f"# HELP {name} {help_text}", f"{name}{suffix} {value}"))
+
+        def histogram(name, help_text, h: Histogram):
+            counts = list(h.counts)
+            out.extend((f"# TYPE {name} histogram", f"# HELP {name} {help_text}"))
+            total = 0
+            for bound, n in zip(h.buckets + (float("inf"),), counts):
+                total += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                out.append(f'{name}_bucket{{le="{le}"}} {total}')
+            out.extend((f"{name}_sum {h.sum}", f"{name}_count {total}"))
+
+        metric("focusflow_focus_seconds", "counter", "Total focused time.", stats["total_focus_time"], "_total")
+        metric("focusflow_sessions", "counter", "Completed focus sessions.", stats["total_sessions"], "_total")
+        metric("focusflow_streak_current", "gauge", "Current session streak.", stats["current_streak"])
+        metric("focusflow_streak_longest", "gauge", "Longest session streak.", stats["longest_streak"])
+        metric("focusflow_timer_running", "gauge", "1 while the pomodoro timer is running.", int(timer.running))
+        metric("focusflow_timer_on_break", "gauge", "1 during a break.", int(timer.is_break))
+        metric("focusflow_timer_remaining_seconds", "gauge", "Seconds left on the timer.", round(timer.remaining, 3))
+        metric("focusflow_saves", "counter", "Persistence writes.", METRICS.saves, "_total")
+        metric("focusflow_saves_per_minute", "gauge", "Persistence writes in the last minute.",
+               METRICS.saves_last_minute())
+        histogram("focusflow_frame_seconds", "Main loop work per frame, excluding the frame-cap sleep.", METRICS.frame_seconds)
+        histogram("focusflow_dialog_open_seconds", "Time from request to dialog shown.", METRICS.dialog_open_seconds)
+        histogram("focusflow_alarm_start_seconds", "Time from session end to alarm playing.",
+                  METRICS.alarm_start_seconds)
+        out.append("# EOF")
+        return "\n".join(out) + "\n"
+
+NO_DUE = "9999-12-31"
+
+class TaskIndex:
+    """Sorted views over the task list, maintained incrementally.
+
+    Each view is a list of (key..., uid) tuples kept in order with bisect, so a
+    single task change costs O(log n) comparisons instead of re-sorting the list.
+    """
+    VIEWS: dict[str, Callable[[Task], tuple]] = {
+        "due": lambda t: (t.due or NO_DUE, -t.priority, t.uid),
+        "score": lambda t: (-t.score, t.due or NO_DUE, t.uid),
+        "incomplete": lambda t: (t.complete, t.due or NO_DUE, -t.priority, -t.score, t.uid),
+    }
+    LABELS = {"due": "by due date", "score": "by points", "incomplete": "incomplete first"}
+
+    def __init__(self):
+        self.views: dict[str, list] = {name: [] for name in self.VIEWS}
+        self.by_uid: dict[str, Task] = {}
+        self._keys: dict[str, tuple] = {}
+        self._cache: dict[str, List[Task]] = {}
+
+    def rebuild(self, tasks: List[Task]) -> None:
+        """Index a whole list (load, import, sync)"""
+        self.by_uid = {t.uid: t for t in tasks}
+        self._keys = {t.uid: tuple(fn(t) for fn in self.VIEWS.values()) for t in tasks}
+        for n, name in enumerate(self.VIEWS):
+            self.views[name] = sorted(keys[n] for keys in self._keys.values())
+        self._cache.clear()
+
+    def add(self, task: Task) -> None:
+        """Index one task"""
+        keys = tuple(fn(task) for fn in self.VIEWS.values())
+        for view, key in zip(self.views.values(), keys):
+            bisect.insort(view, key)
+        self._keys[task.uid] = keys
+        self.by_uid[task.uid] = task
+        self._cache.clear()
+
+    def discard(self, task: Task) -> None:
+        """Drop one task from every view"""
+        keys = self._keys.pop(task.uid, None)
+        if keys is None:
+            return
+        for view, key in zip(self.views.values(), keys):
+            i = bisect.bisect_left(view, key)
+            if i < len(view) and view[i] == key:
+                del view[i]
+        self.by_uid.pop(task.uid, None)
+        self._cache.clear()
+
+    def refresh(self, task: Task) -> None:
+        """Re-position a task after its fields changed"""
+        self.discard(task)
+        self.add(task)
+
+    def ordered(self, name: str) -> List[Task]:
+        """Tasks in a view's order (cached until the next change)"""
+        if name not in self._cache:
+            self._cache[name] = [self.by_uid[key[-1]] for key in self.views[name]]
+        return self._cache[name]
+
+    def next_task(self) -> Task | None:
+        """Most pressing incomplete task: earliest due, then priority, then points"""
+        view = self.views["incomplete"]
+        if not view or view[0][0]:
+            return None
+        return self.by_uid[view[0][-1]]
+
+def _increasing_subsequence(keys: list) -> set[int]:
+    """Indices of a longest strictly increasing run of keys (None entries never kept)"""
+    tails, tail_idx, prev = [], [], [-1] * len(keys)
+    for i, k in enumerate(keys):
+        if k is None:
+            continue
+        pos = bisect.bisect_left(tails, k)
+        prev[i] = tail_idx[pos - 1] if pos else -1
+        if pos == len(tails):
+            tails.append(k)
+            tail_idx.append(i)
+        else:
+            tails[pos] = k
+            tail_idx[pos] = i
+    keep, i = set(), tail_idx[-1] if tail_idx else -1
+    while i != -1:
+        keep.add(i)
+        i = prev[i]
+    return keep
+
+class SyncLog:
+    """Operation-based sync through a shared directory, one append-only log per device.
+
+    Task fields (text, complete, score, due, priority, order, deleted) are last-writer-wins
+    registers stamped with (lamport, device), so concurrent edits to different
+    fields merge and the same field resolves identically everywhere. Per-day
+    stat counters are increments, which commute. Other devices' logs are read
+    from the byte offset reached at the previous merge, so each merge costs
+    only what changed. The merged state and offsets are snapshotted to
+    cfg/sync_state.json, so a launch resumes instead of replaying every log.
+    """
+    def __init__(self, sync_dir: str, device_id: str):
+        self.dir = sync_dir
+        self.device = device_id
+        self.path = os.path.join(sync_dir, f"{device_id}.jsonl")
+        self.fresh = not os.path.exists(self.path)
+        self.lamport = 0
+        self.offsets: dict[str, int] = {}
+        self.stamps: dict[tuple[str, str], tuple[int, str]] = {}
+        self.values: dict[str, dict] = {}
+        self.counters: dict[tuple[str, str], int] = {}
+        self._outbox: List[str] = []
+
+    @classmethod
+    def load(cls, sync_dir: str, device_id: str) -> "SyncLog":
+        """Resume from the saved snapshot, or start empty if there is none for this folder"""
+        log = cls(sync_dir, device_id)
+        try:
+            with open(SYNC_STATE_PATH, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return log
+        if log.fresh or state.get("dir") != sync_dir or state.get("device") != device_id:
+            return log  # different folder, or our log is gone: rebuild from the logs
+        try:
+            log.lamport = state["lamport"]
+            log.offsets = state["offsets"]
+            log.stamps = {(uid, f): (n, dev) for uid, f, n, dev in state["stamps"]}
+            log.values = state["values"]
+            log.counters = {(k, day): n for k, day, n in state["counters"]}
+            log._outbox = state["outbox"]
+        except (KeyError, TypeError, ValueError):
+            print("Sync snapshot is invalid, replaying logs")
+            return cls(sync_dir, device_id)
+        log._settle_own(log.lamport)
+        return log
+
+    def _settle_own(self, saved_lamport: int) -> None:
+        """Reconcile our own log with a snapshot that may predate the last flush"""
+        try:
+            ops = self._read_new(self.path)
+        except OSError:
+            return
+        written = set()
+        for op in ops:
+            if op["ts"][0] > saved_lamport:
+                self._apply(op)  # emitted after the snapshot was taken
+            written.add(tuple(op["ts"]))
+        self._outbox = [line for line in self._outbox if tuple(json.loads(line)["ts"]) not in written]
+
+    def save_state(self) -> None:
+        """Snapshot offsets, clock and merged state so the next launch resumes from here"""
+        state = {
+            "dir": self.dir,
+            "device": self.device,
+            "lamport": self.lamport,
+            "offsets": self.offsets,
+            "stamps": [[uid, f, n, dev] for (uid, f), (n, dev) in self.stamps.items()],
+            "values": self.values,
+            "counters": [[k, day, n] for (k, day), n in self.counters.items()],
+            "outbox": self._outbox,
+        }
+        try:
+            os.makedirs("cfg", exist_ok=True)
+            tmp = SYNC_STATE_PATH + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp, SYNC_STATE_PATH)
+        except OSError as e:
+            print(f"Failed to save sync state: {e}")
+
+    @staticmethod
+    def device_id() -> str:
+        """Stable id for this install, created on first use"""
+        try:
+            with open(DEVICE_PATH, "r", encoding="utf-8") as f:
+                return json.load(f)["device_id"]
+        except (OSError, ValueError, KeyError):
+            device = uuid.uuid4().hex[:12]
+            os.makedirs("cfg", exist_ok=True)
+            with open(DEVICE_PATH, "w", encoding="utf-8") as f:
+                json.dump({"device_id": device}, f, indent=2)
+            return device
+
+    def _apply(self, op: dict) -> tuple[bool, tuple | None]:
+        """Apply one op. Returns (task state changed, counter delta or None)."""
+        stamp = tuple(op["ts"])
+        self.lamport = max(self.lamport, stamp[0])
+        if op["op"] == "inc":
+            key = (op["k"], op["day"])
+            self.counters[key] = self.counters.get(key, 0) + op["n"]
+            return False, (op["k"], op["day"], op["n"])
+        key = (op["uid"], op["f"])
+        if stamp <= self.stamps.get(key, (0, "")):
+            return False, None
+        self.stamps[key] = stamp
+        self.values.setdefault(op["uid"], {})[op["f"]] = op["v"]
+        return True, None
+
+    def _emit(self, op: dict) -> None:
+        self.lamport += 1
+        op["ts"] = [self.lamport, self.device]
+        self._apply(op)
+        self._outbox.append(json.dumps(op, separators=(",", ":")))
+
+    def set(self, uid: str, field_name: str, value) -> None:
+        """Record a local task field change"""
+        values = self.values.get(uid, {})
+        if field_name not in values or values[field_name] != value:
+            self._emit({"op": "set", "uid": uid, "f": field_name, "v": value})
+
+    def record_task(self, task: Task) -> None:
+        """Record every field of a (new or revived) task"""
+        for name in ("text", "complete", "score", "due", "priority"):
+            self.set(task.uid, name, getattr(task, name))
+        self.set(task.uid, "deleted", False)
+
+    def inc(self, kind: str, day: str, n: int) -> None:
+        """Record a local counter change"""
+        if n:
+            self._emit({"op": "inc", "k": kind, "day": day, "n": n})
+
+    def flush(self) -> None:
+        """Append pending local ops to this device's log in one write.
+
+        Best-effort: if the shared folder is unavailable the ops stay queued
+        and go out with the next flush.
+        """
+        if not self._outbox:
+            return
+        data = ("\n".join(self._outbox) + "\n").encode("utf-8")
+        try:
+            os.makedirs(self.dir, exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(data)
+        except OSError as e:
+            print(f"Sync folder unavailable, will retry: {e}")
+            return
+        # Our own ops are already applied; skip past them when reading our log
+        self.offsets[self.path] = self.offsets.get(self.path, 0) + len(data)
+        self._outbox.clear()
+        self.fresh = False
+
+    def _read_new(self, path: str) -> List[dict]:
+        offset = self.offsets.get(path, 0)
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+        end = chunk.rfind(b"\n") + 1  # ignore a partially written last line
+        self.offsets[path] = offset + end
+        ops = []
+        for line in chunk[:end].splitlines():
+            try:
+                ops.append(json.loads(line))
+            except ValueError:
+                print(f"Skipping bad sync op in {path}")
+        return ops
+
+    def merge(self, include_own: bool = False) -> tuple[bool, List[tuple]]:
+        """Read new ops from the other devices' logs.
+
+        Returns (task state changed, counter deltas to apply).
+        """
+        changed, deltas = False, []
+        try:
+            names = sorted(os.listdir(self.dir))
+        except OSError:
+            return False, []
+        for name in names:
+            path = os.path.join(self.dir, name)
+            if not name.endswith(".jsonl") or (path == self.path and not include_own):
+                continue
+            try:
+                ops = self._read_new(path)
+            except OSError as e:
+                print(f"Failed to read sync log {name}: {e}")
+                continue
+            for op in ops:
+                task_changed, delta = self._apply(op)
+                changed |= task_changed
+                if delta:
+                    deltas.append(delta)
+        return changed, deltas
+
+    def live_order(self) -> List[str]:
+        """Uids of non-deleted tasks in merged order"""
+        live = [(v.get("order", 0.0), uid) for uid, v in self.values.items()
+                if "text" in v and not v.get("deleted")]
+        return [uid for _, uid in sorted(live)]
+
+    def _top_order(self) -> float:
+        return max((v.get("order", 0.0) for v in self.values.values()), default=0.0)
+
+    def order_between(self, lo: float | None, hi: float | None) -> float:
+        """A fractional order key between two neighbours (None = no neighbour)"""
+        if lo is None and hi is None:
+            return float(int(self._top_order()) + 1)
+        if lo is None:
+            return hi - 1
+        if hi is None:
+            return lo + 1
+        return (lo + hi) / 2
+
+    def record_order(self, uids: List[str]) -> None:
+        """Give tasks fractional order keys matching the list, touching as few tasks as possible"""
+        keys = [self.values.get(u, {}).get("order") for u in uids]
+        keep = _increasing_subsequence(keys)
+        top = None
+        i = 0
+        while i < len(uids):
+            if i in keep:
+                i += 1
+                continue
+            j = i
+            while j < len(uids) and j not in keep:
+                j += 1
+            lo = keys[i - 1] if i > 0 else None
+            hi = keys[j] if j < len(uids) else None
+            run = j - i
+            for n in range(run):
+                if lo is None and hi is None:
+                    # Nothing local to anchor to: append after every known task
+                    top = float(int(self._top_order()) + 1) if top is None else top + 1
+                    key = top
+                elif lo is None:
+                    key = hi - (run - n)
+                elif hi is None:
+                    key = lo + n + 1
+                else:
+                    key = lo + (hi - lo) * (n + 1) / (run + 1)
+                keys[i + n] = key
+                self.set(uids[i + n], "order", key)
+            i = j
+
 class TaskStore:
     """Manages loading and saving tasks"""
     def __init__(self):
         self.tasks: List[Task] = []
+        self.sync: SyncLog | None = None
+        self.generation = 0    # journal entries only apply on top of the matching state.json
+        self._journal_len = 0
+        self.version = 0       # bumped on every change so derived views know when to rebuild
+        self.index = TaskIndex()
 
     def load(self) -> None:
-        """Load tasks"""
+        """Load tasks, then replay any journaled deltas saved since"""
+        missing_uids = False
         if os.path.exists(SAVE_PATH):
             try:
                 with open(SAVE_PATH, "r", encoding="utf-8") as f:
-                    self.tasks = [Task(**t) for t in json.load(f).get("tasks", [])]
+                    data = json.load(f)
+                    self.tasks = [Task(**t) for t in data.get("tasks", [])]
+                    self.generation = data.get("generation", 0)
+                    missing_uids = any("uid" not in t for t in data.get("tasks", []))
             except Exception as e:
                 print(f"Failed to load tasks: {e}")
+        if os.path.exists(JOURNAL_PATH):
+            try:
+                with open(JOURNAL_PATH, "r", encoding="utf-8") as f:
+                    for line in f:
+                        entry = json.loads(line)
+                        if entry["g"] == self.generation:
+                            self.apply(tuple(entry["cmd"]), journal=False)
+                            self._journal_len += 1
+            except Exception as e:
+                print(f"Failed to replay task journal: {e}")
+        self.index.rebuild(self.tasks)
+        if missing_uids:
+            self.save()  # pin the generated uids before stats or sync refer to them
 
     def save(self) -> None:
         "Save tasks"
         os.makedirs("cfg", exist_ok=True)
-        with open(SAVE_PATH, "w", encoding="utf-8") as f:
-            json.dump({"tasks": [t.__dict__ for t in self.tasks]}, f, indent=2)
+        self.generation += 1
+        with open(SAVE_PATH + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"generation": self.generation, "tasks": [asdict(t) for t in self.tasks]}, f, indent=2)
+        os.replace(SAVE_PATH + ".tmp", SAVE_PATH)
+        METRICS.saved()
+        if self._journal_len:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(JOURNAL_PATH)
+            self._journal_len = 0
+
+    def apply(self, cmd: tuple, journal: bool = True) -> None:
+        """Apply one compact task delta (see History) and append it to the journal"""
+        self.version += 1
+        kind, i = cmd[0], cmd[1]
+        if kind == "insert":
+            self.tasks.insert(i, Task(*cmd[2:]))
+            self.index.add(self.tasks[i])
+        elif kind == "remove":
+            removed = self.tasks.pop(i)
+            self.index.discard(removed)
+        elif kind == "update":
+            for name, value in cmd[3].items():
+                setattr(self.tasks[i], name, value)
+            self.index.refresh(self.tasks[i])
+        elif kind == "toggle":
+            self.tasks[i].complete ^= True
+            self.index.refresh(self.tasks[i])
+        elif kind == "move":
+            self.tasks.insert(cmd[2], self.tasks.pop(i))
+        if journal:
+            self._append_journal(cmd)
+            if self.sync:
+                # Sync ops come straight from the command: only what changed
+                if kind == "insert":
+                    self.sync.record_task(self.tasks[i])
+                    self._sync_position(i)
+                elif kind == "remove":
+                    self.sync.set(removed.uid, "deleted", True)
+                elif kind == "update":
+                    for name, value in cmd[3].items():
+                        self.sync.set(self.tasks[i].uid, name, value)
+                elif kind == "toggle":
+                    self.sync.set(self.tasks[i].uid, "complete", self.tasks[i].complete)
+                elif kind == "move":
+                    self._sync_position(cmd[2])
+
+    def _sync_position(self, i: int) -> None:
+        """Give the task at i an order key between its neighbours'"""
+        def key(j):
+            return self.sync.values.get(self.tasks[j].uid, {}).get("order") if 0 <= j < len(self.tasks) else None
+        lo, hi = key(i - 1), key(i + 1)
+        if lo is not None and hi is not None and lo >= hi:
+            self.sync.record_order([t.uid for t in self.tasks])  # keys out of step: re-key minimally
+            return
+        self.sync.set(self.tasks[i].uid, "order", self.sync.order_between(lo, hi))
+
+    def _append_journal(self, cmd: tuple) -> None:
+        """Persist one delta with a single append; compact into state.json once it grows"""
+        if self._journal_len >= JOURNAL_COMPACT:
+            self.save()
+            return
+        os.makedirs("cfg", exist_ok=True)
+        with open(JOURNAL_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"g": self.generation, "cmd": cmd}) + "\n")
+        self._journal_len += 1
+        METRICS.saved()
+
+    def attach_sync(self, sync: SyncLog) -> None:
+        """Start syncing; a device's first sync seeds its log with the local tasks"""
+        self.sync = sync
+        if sync.fresh:
+            for t in self.tasks:
+                sync.record_task(t)
+            sync.record_order([t.uid for t in self.tasks])
+            sync.flush()
+        self.apply_sync()
+
+    def apply_sync(self) -> None:
+        """Rebuild the task list from merged sync state, keeping existing Task objects.
+
+        Saves if anything changed: journaled indices only hold for the list they were recorded on.
+        """
+        before = [astuple(t) for t in self.tasks]
+        by_uid = {t.uid: t for t in self.tasks}
+        tasks = []
+        for uid in self.sync.live_order():
+            values = self.sync.values[uid]
+            t = by_uid.get(uid) or Task(values["text"], uid=uid)
+            t.text = values["text"]
+            t.complete = values.get("complete", False)
+            t.score = values.get("score", 10)
+            t.due = values.get("due", "")
+            t.priority = values.get("priority", 0)
+            tasks.append(t)
+        self.tasks = tasks
+        self.index.rebuild(tasks)
+        if [astuple(t) for t in tasks] != before:
+            self.version += 1
+            self.save()
+
+    @staticmethod
+    def iter_import(path: str) -> Iterator[Task]:
+        """Stream tasks from a Markdown checklist (.md), CSV (.csv) or plain text file.
+
+        Markdown: only "- [ ] task" / "- [x] task" lines are imported.
+        CSV: columns text[,complete][,score]; an optional "text" header row is skipped.
+        Plain text: one task per non-empty line.
+        """
+        ext = os.path.splitext(path)[1].lower()
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:  # tolerate a BOM
+            if ext == ".csv":
+                for row in csv.reader(f):
+                    if not row or not row[0].strip() or row[0].strip().lower() == "text":
+                        continue
+                    complete = len(row) > 1 and row[1].strip().lower() in ("1", "true", "x", "yes")
+                    try:
+                        score = int(row[2].strip()) if len(row) > 2 else 10
+                    except ValueError:
+                        score = 10
+                    yield Task(row[0].strip(), complete, score)
+            elif ext in (".md", ".markdown"):
+                for line in f:
+                    m = CHECKLIST_RE.match(line)
+                    if m:
+                        yield Task(m.group(2), m.group(1) != " ")
+            else:
+                for line in f:
+                    if line.strip():
+                        yield Task(line.strip())
+
+    def bulk_import(self, path: str, batch_size: int = IMPORT_BATCH) -> int:
+        """Append tasks from a file in batches, saving once at the end. Returns the count added.
+
+        All or nothing: if reading fails part-way, the batches already appended are dropped.
+        """
+        stream = self.iter_import(path)
+        added = 0
+        try:
+            while batch := list(itertools.islice(stream, batch_size)):
+                self.tasks.extend(batch)
+                added += len(batch)
+        except BaseException:
+            del self.tasks[len(self.tasks) - added:]
+            raise
+        if added:
+            self.version += 1
+            self.index.rebuild(self.tasks)
+            self.save()
+            if self.sync:
+                top = None
+                for t in self.tasks[-added:]:
+                    self.sync.record_task(t)
+                    top = self.sync.order_between(None, None) if top is None else top + 1
+                    self.sync.set(t.uid, "order", top)
+                self.sync.flush()
+        return added
 
 class StatsStore:
     """Manages loading, saving, and updating user statistics"""
@@ -188,8 +1034,12 @@ class StatsStore:
             "longest_streak": 0,
             "current_streak": 0,
             "daily_records": {},
-            "daily_task_scores": {}
+            "daily_task_scores": {},
+            "task_focus": {}  # task uid -> focused seconds
         }
+        self.version = 0  # bumped on every change so cached charts know when to re-render
+        self.dirty = False  # changes recorded with save=False, written by save_if_dirty
+        self.sync: SyncLog | None = None
 
     def load(self) -> None:
         """Load daily task scores"""
@@ -198,15 +1048,25 @@ class StatsStore:
                 with open(STATS_PATH, "r", encoding="utf-8") as f:
                     loaded = json.load(f)
                     self.stats.update(loaded)
+                    self.version += 1
             except Exception as e:
                 print(f"Failed to load stats: {e}")
-        self.save()
+                return
+        if not os.path.exists(STATS_PATH) or loaded.keys() != self.stats.keys():
+            self.save()  # only write back when creating the file or filling in new keys
 
     def save(self) -> None:
         """Save daily task scores"""
         os.makedirs("cfg", exist_ok=True)
         with open(STATS_PATH, "w", encoding="utf-8") as f:
             json.dump(self.stats, f, indent=2)
+        self.dirty = False
+        METRICS.saved()
+
+    def save_if_dirty(self, _timer=None) -> None:
+        """Write batched changes, if any (Scheduler callback)"""
+        if self.dirty:
+            self.save()
 
     def record_session(self, duration_seconds: int) -> None:
         """Save current session"""
@@ -222,28 +1082,306 @@ class StatsStore:
         if self.stats["current_streak"] > self.stats["longest_streak"]:
             self.stats["longest_streak"] = self.stats["current_streak"]
         self.stats["daily_records"][today] = self.stats["daily_records"].get(today, 0) + 1
+        self.version += 1
+        if self.sync:
+            self.sync.inc("sessions", today, 1)
+            self.sync.inc("focus", today, duration_seconds)
         self.save()
+        if self.sync:
+            self.sync.flush()
 
-    def record_task_completion(self, score: int) -> None:
+    def record_task_completion(self, score: int, save: bool = True) -> None:
         """Record complete tasks"""
         today = datetime.now().strftime("%Y-%m-%d")
         self.stats[
             "daily_task_scores"][today] = self.stats[
                 "daily_task_scores"].get(today, 0) + score
-        self.save()
+        self.version += 1
+        if self.sync:
+            self.sync.inc("score", today, score)
+        self._commit(save)
 
-    def deduct_task_score(self, score: int) -> None:
+    def deduct_task_score(self, score: int, save: bool = True) -> None:
         """Remove pts if task unticked"""
         today = datetime.now().strftime("%Y-%m-%d")
         if today in self.stats["daily_task_scores"]:
-            self.stats["daily_task_scores"][today] = max(
-                0, self.stats["daily_task_scores"][today] - score
-                )
+            before = self.stats["daily_task_scores"][today]
+            self.stats["daily_task_scores"][today] = max(0, before - score)
+            self.version += 1
+            if self.sync:
+                self.sync.inc("score", today, self.stats["daily_task_scores"][today] - before)
+            self._commit(save)
+
+    def record_task_focus(self, uid: str, seconds: int, save: bool = True) -> None:
+        """Add focused seconds to a task's running total"""
+        self.stats["task_focus"][uid] = self.stats["task_focus"].get(uid, 0) + seconds
+        self.version += 1
+        if self.sync:
+            self.sync.inc("task_focus", uid, seconds)
+        self._commit(save)
+
+    def _commit(self, save: bool) -> None:
+        """Write now and push to sync, or leave both to the caller's batch"""
+        if not save:
+            self.dirty = True
+            return
         self.save()
+        if self.sync:
+            self.sync.flush()
+
+    def top_task_focus(self, n: int) -> List[tuple[str, int]]:
+        """The n tasks with the most focus time, as (uid, seconds)"""
+        return heapq.nlargest(n, self.stats["task_focus"].items(), key=lambda item: item[1])
+
+    def attach_sync(self, sync: SyncLog) -> None:
+        """Start syncing counters; a device's first sync seeds its log with local history"""
+        self.sync = sync
+        if sync.fresh:
+            for day, n in self.stats["daily_records"].items():
+                sync.inc("sessions", day, n)
+            for day, n in self.stats["daily_task_scores"].items():
+                sync.inc("score", day, n)
+            sync.inc("focus", "", self.stats["total_focus_time"])
+            for uid, seconds in self.stats["task_focus"].items():
+                sync.inc("task_focus", uid, seconds)
+            sync.flush()
+        # The logs are now the source of truth for synced counters
+        self.stats["total_focus_time"] = self.stats["total_sessions"] = 0
+        self.stats["daily_records"], self.stats["daily_task_scores"] = {}, {}
+        self.stats["task_focus"] = {}
+        self.apply_sync([(k, day, n) for (k, day), n in sync.counters.items()])
+
+    def apply_sync(self, deltas: List[tuple]) -> None:
+        """Apply merged counter increments"""
+        for kind, day, n in deltas:
+            if kind == "sessions":
+                self.stats["daily_records"][day] = self.stats["daily_records"].get(day, 0) + n
+                self.stats["total_sessions"] += n
+            elif kind == "score":
+                self.stats["daily_task_scores"][day] = self.stats["daily_task_scores"].get(day, 0) + n
+            elif kind == "focus":
+                self.stats["total_focus_time"] += n
+            elif kind == "task_focus":
+                self.stats["task_focus"][day] = self.stats["task_focus"].get(day, 0) + n
+        if deltas:
+            self.version += 1
+
+class MemoryProbe:
+    """Opt-in long-run memory instrumentation (--memprofile or FOCUSFLOW_MEMPROFILE=1).
+
+    Takes periodic tracemalloc snapshots, counts live Task objects and the
+    pg.Surfaces the app creates, and writes a rotating report of the
+    fastest-growing allocation sites to cfg/.
+    """
+    surfaces: "weakref.WeakSet[pg.Surface]" = weakref.WeakSet()
+    tracking = False
+
+    def __init__(self, top: int = 15):
+        self.top = top
+        self.started = time.monotonic()
+        self.baseline = None
+        self.previous = None
+        self.reports = 0
+        MemoryProbe.tracking = True
+        tracemalloc.start(10)
+
+    @staticmethod
+    def enabled() -> bool:
+        """Whether instrumentation was requested for this run"""
+        return "--memprofile" in sys.argv or os.environ.get("FOCUSFLOW_MEMPROFILE") == "1"
+
+    @classmethod
+    def track(cls, surf: pg.Surface) -> pg.Surface:
+        """Register an app-created Surface for the live count while profiling. Returns surf."""
+        if cls.tracking:
+            cls.surfaces.add(surf)
+        return surf
+
+    @classmethod
+    def count_live(cls) -> dict[str, int]:
+        """Count live objects of the types we suspect of leaking"""
+        # Surfaces hold no Python references, so the gc never sees them: count the registry
+        tasks = sum(1 for obj in gc.get_objects() if isinstance(obj, Task))
+        return {"Surface": len(cls.surfaces), "Task": tasks}
+
+    def snapshot(self, _timer=None) -> None:
+        """Take a snapshot and write the diff report (Scheduler callback)"""
+        snap = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        if self.baseline is None:
+            self.baseline = snap
+        current, peak = tracemalloc.get_traced_memory()
+        elapsed = int(time.monotonic() - self.started)
+        lines = [
+            f"Focus Flow memory report #{self.reports} - {datetime.now():%Y-%m-%d %H:%M:%S}",
+            f"Uptime: {elapsed // 3600}h {elapsed % 3600 // 60}m",
+            f"Traced: {current / 1024:.1f} KiB (peak {peak / 1024:.1f} KiB)",
+            "Live objects: " + ", ".join(f"{k}={v}" for k, v in self.count_live().items()),
+        ]
+        for title, ref in (("since start", self.baseline), ("since last report", self.previous)):
+            if ref is None:
+                continue
+            lines += ["", f"Top growing allocation sites {title}:"]
+            growing = [d for d in snap.compare_to(ref, "lineno") if d.size_diff > 0]
+            lines += [f"  {d}" for d in growing[:self.top]] or ["  (none)"]
+        self.previous = snap
+        self.reports += 1
+        self._write("\n".join(lines) + "\n")
+
+    @staticmethod
+    def _write(text: str) -> None:
+        os.makedirs("cfg", exist_ok=True)
+        for i in range(MEMORY_REPORT_KEEP - 1, 0, -1):
+            older = f"{MEMORY_REPORT_PATH}.{i}"
+            newer = MEMORY_REPORT_PATH if i == 1 else f"{MEMORY_REPORT_PATH}.{i - 1}"
+            if os.path.exists(newer):
+                os.replace(newer, older)
+        with open(MEMORY_REPORT_PATH, "w", encoding="utf-8") as f:
+            f.write(text)
+
+class ChartRenderer:
+    """Renders the stats charts to a pg.Surface on a worker thread.
+
+    The UI thread only ever blits the last finished surface; a new render is
+    queued when the StatsStore version or the chart size changes.
+    """
+    DAYS = 14
+    WEEKS = 12
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = None    # (key, data) waiting for the worker
+        self._submitted = None  # key most recently queued
+        self._ready = None      # (key, surface) last finished render
+        self._thread = None
+
+    def get(self, stats: "StatsStore", size: tuple[int, int]) -> pg.Surface | None:
+        """Latest chart surface (possibly stale), queueing a re-render if out of date"""
+        key = (stats.version, size)
+        with self._lock:
+            ready = self._ready
+            if (ready is None or ready[0] != key) and self._submitted != key:
+                data = {
+                    "daily_records": dict(stats.stats["daily_records"]),
+                    "daily_task_scores": dict(stats.stats["daily_task_scores"]),
+                }
+                self._pending = (key, data)
+                self._submitted = key
+                self._wake.set()
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._worker, daemon=True)
+                    self._thread.start()
+        return ready[1] if ready else None
+
+    def _worker(self) -> None:
+        font = pg.font.SysFont("consolas", 12)  # own font: pygame fonts are not thread-safe
+        while True:
+            self._wake.wait()
+            with self._lock:
+                job, self._pending = self._pending, None
+                self._wake.clear()
+            if job is None:
+                continue
+            key, data = job
+            try:
+                surf = self._render(key[1], data, font)
+            except Exception as e:
+                print(f"Failed to render charts: {e}")
+                time.sleep(1)  # throttle retries of a persistent failure
+                with self._lock:
+                    if self._submitted == key:
+                        self._submitted = None  # let the next get() queue it again
+                continue
+            with self._lock:
+                self._ready = (key, surf)
+
+    def _render(self, size: tuple[int, int], data: dict, font) -> pg.Surface:
+        w, h = size
+        surf = MemoryProbe.track(pg.Surface(size))
+        surf.fill(COLOR_BG)
+        today = datetime.now()
+        days = [(today - timedelta(days=i)) for i in range(self.DAYS - 1, -1, -1)]
+        sessions = [data["daily_records"].get(d.strftime("%Y-%m-%d"), 0) for d in days]
+        points = [data["daily_task_scores"].get(d.strftime("%Y-%m-%d"), 0) for d in days]
+
+        # Sessions per day (bars) with points per day (line) overlaid
+        panel_h = h // 2 - 20
+        surf.blit(font.render(f"Last {self.DAYS} days: sessions (bars) vs points (line)", True, COLOR_TEXT), (0, 0))
+        top, bottom = 18, 18 + panel_h
+        slot = w / self.DAYS
+        max_sessions = max(sessions) or 1
+        max_points = max(points) or 1
+        line = []
+        for i, (d, n, pts) in enumerate(zip(days, sessions, points)):
+            bar_h = int((panel_h - 14) * n / max_sessions)
+            x = int(i * slot)
+            pg.draw.rect(surf, COLOR_DONE, (x + 2, bottom - 14 - bar_h, int(slot) - 4, bar_h))
+            line.append((x + int(slot) // 2, bottom - 14 - int((panel_h - 14) * pts / max_points)))
+            surf.blit(font.render(d.strftime("%a")[0], True, COLOR_DIM), (x + int(slot) // 2 - 3, bottom - 12))
+        pg.draw.lines(surf, COLOR_BREAK, False, line, 2)
+
+        # Weekly focus trend (sessions per week)
+        weekly = [0] * self.WEEKS
+        start = (today - timedelta(days=today.weekday())).date()
+        for day, n in data["daily_records"].items():
+            try:
+                age = (start - datetime.strptime(day, "%Y-%m-%d").date()).days
+            except ValueError:
+                continue
+            week = (age + 6) // 7 if age > 0 else 0
+            if 0 <= week < self.WEEKS:
+                weekly[self.WEEKS - 1 - week] += n
+        top = bottom + 12
+        surf.blit(font.render(f"Sessions per week (last {self.WEEKS} weeks)", True, COLOR_TEXT), (0, top))
+        top += 18
+        trend_h = h - top - 4
+        max_week = max(weekly) or 1
+        step = w / (self.WEEKS - 1)
+        trend = [(int(i * step), top + trend_h - int(trend_h * n / max_week)) for i, n in enumerate(weekly)]
+        pg.draw.lines(surf, COLOR_DONE, False, trend, 2)
+        for pt in trend:
+            pg.draw.circle(surf, COLOR_TEXT, pt, 3)
+        return surf
+
+class History:
+    """Bounded undo/redo stacks of compact task deltas.
+
+    Commands are plain tuples so a 100-deep history stays small:
+      ("insert", i, *task_fields) / ("remove", i, *task_fields)
+      ("update", i, {old field values}, {new field values})
+      ("toggle", i)
+      ("move", src, dst)
+    """
+    def __init__(self, limit: int = UNDO_LIMIT):
+        self.undo_stack: deque = deque(maxlen=limit)
+        self.redo_stack: deque = deque(maxlen=limit)
+
+    def record(self, cmd: tuple) -> None:
+        """Remember a newly performed command"""
+        self.undo_stack.append(cmd)
+        self.redo_stack.clear()
+
+    @staticmethod
+    def inverse(cmd: tuple) -> tuple:
+        """The command that reverts cmd"""
+        kind = cmd[0]
+        if kind == "insert":
+            return ("remove",) + cmd[1:]
+        if kind == "remove":
+            return ("insert",) + cmd[1:]
+        if kind == "update":
+            return ("update", cmd[1], cmd[3], cmd[2])
+        if kind == "move":
+            return ("move", cmd[2], cmd[1])
+        return cmd  # toggle is its own inverse
 
 # Dialog helper
 def threaded_dialog(func, *args, **kwargs):
     """Run a Tkinter dialog in a separate thread and return the result."""
+    METRICS.dialog_requested()
     result = {"value": None}
     def target():
         result["value"] = func(*args, **kwargs)
@@ -298,6 +1436,7 @@ class Dialogs:
         root.update()
         root.lift()
         root.focus_force()
+        METRICS.dialog_opened()
         root.mainloop()
 
         return result["value"]
@@ -327,18 +1466,21 @@ class Dialogs:
         root.update()
         root.lift()
         root.focus_force()
+        METRICS.dialog_opened()
         root.mainloop()
 
     @staticmethod
     def multiline_task_with_score(
         initial_text: str = "",
-        initial_score: int = 10) -> tuple[str, int] | None:
-        """Prompt user for multi-line task description and point value in a single modal."""
+        initial_score: int = 10,
+        initial_due: str = "",
+        initial_priority: int = 0) -> tuple[str, int, str, int] | None:
+        """Prompt user for task description, points, due date and priority in a single modal."""
         root = tk.Tk()
         root.withdraw()  # hide until we get window position
         root.title("New Task / Edit Task")
         root.attributes("-topmost", True)
-        w, h = 450, 250
+        w, h = 450, 330
         root.geometry(f"{w}x{h}")
         Dialogs._center(root, w, h)
         root.resizable(False, False)
@@ -353,13 +1495,36 @@ class Dialogs:
         points_var = tk.IntVar(value=initial_score)
         tk.Label(root, text="Task Points:", font=("Consolas", 12)).pack()
         tk.Entry(root, textvariable=points_var, width=10, font=("Consolas", 12)).pack(pady=(0, 10))
+
+        # Due date and priority
+        row = tk.Frame(root)
+        row.pack()
+        due_var = tk.StringVar(value=initial_due)
+        priority_var = tk.IntVar(value=initial_priority)
+        tk.Label(row, text="Due (YYYY-MM-DD):", font=("Consolas", 12)).pack(side="left")
+        tk.Entry(row, textvariable=due_var, width=11, font=("Consolas", 12)).pack(side="left", padx=(0, 10))
+        tk.Label(row, text="Priority 0-3:", font=("Consolas", 12)).pack(side="left")
+        tk.Entry(row, textvariable=priority_var, width=3, font=("Consolas", 12)).pack(side="left")
+        error_var = tk.StringVar()
+        tk.Label(root, textvariable=error_var, font=("Consolas", 10), fg="red").pack()
         result = {"value": None}
 
         def ok():
             task_text = text_widget.get("1.0", "end").strip()
-            task_score = points_var.get()
+            try:
+                task_score = points_var.get()
+                priority = priority_var.get()
+                due = due_var.get().strip()
+                if due:
+                    datetime.strptime(due, "%Y-%m-%d")
+            except (tk.TclError, ValueError):
+                error_var.set("Enter whole numbers and a YYYY-MM-DD date.")
+                return
+            if not 0 <= priority <= 3:
+                error_var.set("Priority must be between 0 and 3.")
+                return
             if task_text:  # only return if text is not empty
-                result["value"] = (task_text, task_score)
+                result["value"] = (task_text, task_score, due, priority)
             root.destroy()
 
         def cancel():
@@ -374,10 +1539,32 @@ class Dialogs:
         root.deiconify()   # show the window now that it's positioned
         root.lift()
         root.focus_force()
+        METRICS.dialog_opened()
         root.mainloop()
 
         return result["value"]
 
+    @staticmethod
+    def warm_up() -> None:
+        """Create and destroy a hidden Tk root so the first real dialog opens quickly"""
+        root = tk.Tk()
+        root.withdraw()
+        root.update_idletasks()
+        root.destroy()
+
+    @staticmethod
+    def import_path() -> str | None:
+        """Ask for a task file to import."""
+        root = tk.Tk()
+        root.withdraw()
+        root.attributes("-topmost", True)
+        path = filedialog.askopenfilename(
+            parent=root,
+            title="Import Tasks",
+            filetypes=[("Task lists", "*.md *.markdown *.csv *.txt"), ("All files", "*.*")])
+        root.destroy()
+        return path or None
+
     @staticmethod
     def _center(root, w, h):
         root.update_idletasks()
@@ -415,9 +1602,114 @@ class Dialogs:
         root.deiconify()
         root.lift()
         root.focus_force()
+        METRICS.dialog_opened()
         root.mainloop()
         return result["value"]
 
+class Warmup:
+    """Runs named startup steps on a small thread pool while the splash screen is shown"""
+    def __init__(self, workers: int = 4):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="warmup")
+        self.steps: dict[str, Future] = {}
+
+    def submit(self, name: str, fn: Callable, *deps: str) -> None:
+        """Queue a step; it starts once the named dependency steps have finished"""
+        futures = [self.steps[d] for d in deps]
+        def run():
+            for f in futures:
+                f.result()
+            return fn()
+        self.steps[name] = self.pool.submit(run)
+
+    def progress(self) -> tuple[int, int]:
+        """(finished steps, total steps)"""
+        return sum(f.done() for f in self.steps.values()), len(self.steps)
+
+    def done(self) -> bool:
+        """Whether every step has finished"""
+        return all(f.done() for f in self.steps.values())
+
+    def failed(self, name: str) -> bool:
+        """Whether a finished step raised (the error is printed once)"""
+        err = self.steps[name].exception()
+        if err is not None:
+            print(f"Warm-up step {name!r} failed: {err}")
+        return err is not None
+
+    def shutdown(self) -> None:
+        """Release the pool threads"""
+        self.pool.shutdown(wait=False)
+
+# Text backends
+class SysFontText:
+    """Text through pg.font: render() allocates a Surface per string, which is then blitted"""
+    def __init__(self, name: str, size: int):
+        self.font = pg.font.SysFont(name, size)
+
+    def size(self, text: str) -> tuple[int, int]:
+        """Width and height of text"""
+        return self.font.size(text)
+
+    def get_height(self) -> int:
+        """Line height"""
+        return self.font.get_height()
+
+    def draw(self, surface: pg.Surface, text: str, pos, color) -> pg.Rect:
+        """Draw text with its top-left at pos"""
+        return surface.blit(MemoryProbe.track(self.font.render(text, True, color)), pos)
+
+class FreetypeText:
+    """Text through pygame.freetype: render_to draws glyphs (cached by freetype) straight onto the target"""
+    def __init__(self, name: str, size: int):
+        if not pygame.freetype.get_init():
+            pygame.freetype.init()
+        self.font = pygame.freetype.SysFont(name, size)
+        self.font.pad = True  # line-box metrics like pg.font
+        self._height = self.font.get_sized_height()
+
+    def size(self, text: str) -> tuple[int, int]:
+        """Width and height of text"""
+        return self.font.get_rect(text).width, self._height
+
+    def get_height(self) -> int:
+        """Line height"""
+        return self._height
+
+    def draw(self, surface: pg.Surface, text: str, pos, color) -> pg.Rect:
+        """Draw text with its top-left at pos"""
+        if not text:
+            return pg.Rect(pos, (0, self._height))
+        return self.font.render_to(surface, pos, text, color)
+
+TEXT_BACKENDS = {"sysfont": SysFontText, "freetype": FreetypeText}
+
+def text_backend() -> type:
+    """Backend picked with --text=sysfont|freetype (defaults to TEXT_BACKEND)"""
+    for arg in sys.argv[1:]:
+        if arg.startswith("--text="):
+            name = arg.split("=", 1)[1]
+            if name in TEXT_BACKENDS:
+                return TEXT_BACKENDS[name]
+            print(f"Unknown text backend {name!r}, using {TEXT_BACKEND}")
+    return TEXT_BACKENDS[TEXT_BACKEND]
+
+def bench_text(iterations: int = 2000) -> None:
+    """Time every text backend on the strings a typical main-screen frame draws"""
+    pg.init()
+    target = pg.Surface((BASE_W, BASE_H))
+    sample = [datetime.now().strftime("%A %d %B %Y %I:%M %p"), "Status: Focusing",
+              "Sessions Completed: 3", "Today's Score: 40pts", "+10pts", "Add Task", "Settings"]
+    sample += [f"Task number {i} with a few words of description" for i in range(20)]
+    for name, backend in TEXT_BACKENDS.items():
+        font = backend("consolas", 14)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for line in sample:
+                font.size(line)
+                font.draw(target, line, (20, 20), COLOR_TEXT)
+        elapsed = time.perf_counter() - start
+        print(f"{name:9} {elapsed / iterations * 1000:.3f} ms/frame ({len(sample)} strings, measure + draw)")
+
 @dataclass
 class Button:
     """A simple button UI component"""
@@ -441,37 +1733,45 @@ class Button:
             lines.append(line)
         start_y = self.rect.centery - len(lines)*font.get_height()//2
         for l in lines:
-            surf = font.render(l, True, COLOR_TEXT)
-            screen.blit(surf, (self.rect.centerx - surf.get_width()//2, start_y))
+            font.draw(screen, l, (self.rect.centerx - font.size(l)[0]//2, start_y), COLOR_TEXT)
             start_y += font.get_height()
 
 class FocusApp:
     """Focus application main class"""
     def __init__(self):
         pg.init()
-        self._load_config()
         self.screen = pg.display.set_mode((BASE_W, BASE_H), pg.RESIZABLE)
         pg.display.set_caption(APP_TITLE)
-        pg.display.set_icon(pg.image.load(APP_ICON))
-
-        # Fonts
-        self.font_s = pg.font.SysFont("consolas", 14)
-        self.font_m = pg.font.SysFont("consolas", 20)
-        self.font_l = pg.font.SysFont("consolas", 44)
+        with open_asset(APP_ICON) as f:
+            pg.display.set_icon(pg.image.load(f, APP_ICON))
+        self.splash_font = pg.font.Font(None, 26)  # bundled font: no system font scan before the first frame
 
         # App state
         self.mode = AppMode.SPLASH
+        self.ready = False
         self.timer = PomodoroTimer()
-        self.timer.default_session = self.custom_pomodoro * 60
-        self.timer.custom_break = self.custom_break
-        self.timer.reset(total=self.custom_pomodoro * 60)
+        self.scheduler = Scheduler()
+        self.timeboxes: dict[str, int] = {}  # task uid -> scheduler timer id
+        self._fired_timers: List[ScheduledTimer] = []
+        self.notice = ""
+        self.notice_until = 0.0
+        self.memory_probe = MemoryProbe() if MemoryProbe.enabled() else None
         self.tasks = TaskStore()
-        self.tasks.load()
         self.stats = StatsStore()
-        self.stats.load()
+        self.sync = None
+        self.exporter = None
         self.hover = None
-        self.sounds = None  # lazy-loaded on first alarm
-        self._undo_cache = []
+        self.sound_index: List[str] = []
+        self.sounds: dict[str, pg.mixer.Sound] = {}  # decoded on first use
+        self.mixer_ready = False
+        self.history = History()
+        self.sort_views = [None, *TaskIndex.VIEWS]  # None = manual (drag) order
+        self.sort_view = None
+        self.focus_task: Task | None = None  # active task that focus time is attributed to
+        self._pending_focus = 0.0
+        self._task_report: tuple[tuple, List[str]] = ((), [])
+        self._wrap_cache: dict[tuple[str, int], List[str]] = {}
+        self.charts = ChartRenderer()
 
         # Dragging / click
         self.dragging_task = None
@@ -493,11 +1793,76 @@ class FocusApp:
         self.btn_back = Button(pg.Rect(BASE_W - 120, 20, 100, 40), "← Back")
         self.clock = pg.time.Clock()
 
+        # Everything else loads concurrently while the splash screen is up
+        self.warmup = Warmup()
+        self.warmup.submit("config", self._load_config)
+        self.warmup.submit("fonts", self._load_fonts)
+        self.warmup.submit("tasks", self.tasks.load)
+        self.warmup.submit("stats", self.stats.load)
+        self.warmup.submit("sync", self._load_sync, "config", "tasks", "stats")
+        self.warmup.submit("sounds", self._load_sound_index)
+        self.warmup.submit("layout", self._prelayout, "fonts", "tasks", "sync")
+        self.warmup.submit("dialogs", Dialogs.warm_up)
+
+    def _load_fonts(self) -> None:
+        """Create the UI fonts with the selected text backend"""
+        font = text_backend()
+        self.font_s = font("consolas", 14)
+        self.font_m = font("consolas", 20)
+        self.font_l = font("consolas", 44)
+
+    def _load_sync(self) -> None:
+        """Resume syncing from the snapshot and catch up on the shared logs, if configured"""
+        if self.sync_dir:
+            sync = SyncLog.load(self.sync_dir, SyncLog.device_id())
+            sync.merge(include_own=True)
+            self.tasks.attach_sync(sync)
+            self.stats.attach_sync(sync)
+            sync.save_state()
+            self.sync = sync
+
+    def _load_sound_index(self) -> None:
+        """Open the mixer and list the alarm sounds"""
+        pg.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+        self.mixer_ready = True
+        self.sound_index = [f for f in list_assets(SOUND_DIR) if f.endswith((".wav", ".mp3", ".ogg"))]
+
+    def _prelayout(self) -> None:
+        """Wrap existing tasks so the first main frame hits the layout cache"""
+        width = self.screen.get_width() - 150
+        for t in self.tasks.tasks:
+            self._wrap(self._label(t), width)
+
+    def _finish_warmup(self) -> None:
+        """Apply warm-up results on the main thread once every step is done"""
+        for name in self.warmup.steps:
+            self.warmup.failed(name)
+        self.warmup.shutdown()
+        if not hasattr(self, "font_s"):
+            self._load_fonts()
+        if not hasattr(self, "custom_pomodoro"):
+            self._load_config()
+        self.timer.default_session = self.custom_pomodoro * 60
+        self.timer.custom_break = self.custom_break
+        self.timer.cycle = self.cycle
+        self.timer.reset(total=self.custom_pomodoro * 60)
+        if self.reminder_minutes > 0:
+            self.scheduler.add("Reminder", self.reminder_minutes * 60, self._fired_timers.append, repeat=True)
+        if self.memory_probe:
+            self.scheduler.add("Memory snapshot", MEMORY_SNAPSHOT_INTERVAL, self.memory_probe.snapshot, repeat=True)
+        if self.sync:
+            self.scheduler.add("Sync", SYNC_INTERVAL, self._sync_merge, repeat=True)
+        self.scheduler.add("Stats save", STATS_SAVE_INTERVAL, self.stats.save_if_dirty, repeat=True)
+        if self.metrics_path:
+            self.exporter = MetricsExporter(self.metrics_path, self)
+            self.exporter.start()
+        self.ready = True
+
     def get_task_y(self, idx):
         """Return the y position of a task given its index"""
         y = 220
-        for i, t in enumerate(self.tasks.tasks):
-            row_h = max(28, len(self._wrap(t.text, self.screen.get_width()-150))*18)
+        for i, t in enumerate(self.visible_tasks()):
+            row_h = max(28, len(self._wrap(self._label(t), self.screen.get_width()-150))*18)
             if i == idx:
                 return y
             y += row_h + self.task_padding
@@ -507,47 +1872,117 @@ class FocusApp:
         """Load custom session/break times if they exist"""
         self.custom_pomodoro = DEFAULT_POMODORO // 60
         self.custom_break = 5
+        self.cycle = CycleConfig()
+        self.reminder_minutes = 0
+        self.sync_dir = ""
+        self.metrics_path = ""
         if os.path.exists(CONFIG_PATH):
             try:
                 with open(CONFIG_PATH, "r", encoding="utf-8") as f:
                     data = json.load(f)
                     self.custom_pomodoro = data.get("session_minutes", self.custom_pomodoro)
                     self.custom_break = data.get("break_minutes", self.custom_break)
+                    self.cycle = CycleConfig.from_dict(data.get("cycle", {}))
+                    self.reminder_minutes = data.get("reminder_minutes", self.reminder_minutes)
+                    self.sync_dir = data.get("sync_dir", self.sync_dir)
+                    self.metrics_path = data.get("metrics_path", self.metrics_path)
             except Exception as e:
                 print(e)
+        self._validate_config()
+
+    def _validate_config(self) -> None:
+        """Reset optional settings with the wrong type to their defaults"""
+        reminder = self.reminder_minutes
+        if not isinstance(reminder, int) or isinstance(reminder, bool) or reminder < 0:
+            print(f"Ignoring invalid reminder_minutes: {reminder!r}")
+            self.reminder_minutes = 0
+        for name in ("sync_dir", "metrics_path"):
+            if not isinstance(getattr(self, name), str):
+                print(f"Ignoring invalid {name}: {getattr(self, name)!r}")
+                setattr(self, name, "")
 
     def _save_config(self):
         """Save custom session/break times"""
         os.makedirs("cfg", exist_ok=True)
         with open(CONFIG_PATH, "w", encoding="utf-8") as f:
             json.dump({"session_minutes": self.custom_pomodoro,
-                    "break_minutes": self.custom_break}, f, indent=2)
-
-    def _load_sounds(self) -> list:
-        if not os.path.exists(SOUND_DIR):
-            return []
-        sounds = []
-        for f in os.listdir(SOUND_DIR):
-            if f.endswith((".wav", ".mp3", ".ogg")):
-                try:
-                    sounds.append(pg.mixer.Sound(os.path.join(SOUND_DIR, f)))
-                except Exception:
-                    pass
-        return sounds
+                    "break_minutes": self.custom_break,
+                    "cycle": self.cycle.__dict__,
+                    "reminder_minutes": self.reminder_minutes,
+                    "sync_dir": self.sync_dir,
+                    "metrics_path": self.metrics_path}, f, indent=2)
 
     def _play_alarm(self) -> None:
-        if self.sounds is None:
-            pg.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
-            self.sounds = self._load_sounds()
-        if self.sounds:
-            random.choice(self.sounds).play()
+        start = time.perf_counter()
+        if not self.mixer_ready:
+            try:
+                self._load_sound_index()
+            except pg.error as e:
+                print(f"Audio unavailable: {e}")
+                return
+        if not self.sound_index:
+            return
+        name = random.choice(self.sound_index)
+        if name not in self.sounds:
+            try:
+                with open_asset(name) as f:
+                    self.sounds[name] = pg.mixer.Sound(f)  # decoded up front, so the file can close
+            except Exception as e:
+                print(f"Failed to load sound {name}: {e}")
+                return
+        self.sounds[name].play()
+        METRICS.alarm_start_seconds.observe(time.perf_counter() - start)
+
+    def toggle_timebox(self, idx: int) -> None:
+        """Start (or cancel) a per-task time box of one focus session"""
+        task = self.visible_tasks()[idx]
+        timer_id = self.timeboxes.pop(task.uid, None)
+        if timer_id is not None:
+            self.scheduler.cancel(timer_id)
+            return
+        label = task.text.split("\n")[0][:30]
+        self.timeboxes[task.uid] = self.scheduler.add(
+            f"Time box: {label}", self.custom_pomodoro * 60, self._fired_timers.append)
+
+    def _handle_fired_timers(self) -> None:
+        """Alarm and show a notice for every scheduler timer that fired this tick"""
+        self.scheduler.run_due()
+        if not self._fired_timers:
+            return
+        for timer in self._fired_timers:
+            self.timeboxes = {k: v for k, v in self.timeboxes.items() if v != timer.seq}
+            self.notice = f"{timer.name} - time's up!"
+        self._fired_timers.clear()
+        self.notice_until = time.monotonic() + NOTICE_SECONDS
+        self._play_alarm()
+
+    def _sync_merge(self, _timer=None) -> None:
+        """Pull new ops from other devices (Scheduler callback)"""
+        if self.mouse_down_pos is not None:
+            return  # don't shift task indices mid-drag; next interval will pick it up
+        changed, deltas = self.sync.merge()
+        if changed:
+            self.tasks.apply_sync()
+            self.history = History()  # remote changes invalidate recorded task indices
+            if self.focus_task is not None and self.focus_task.uid not in self.tasks.index.by_uid:
+                self.set_focus_task(None)
+            for uid in [u for u in self.timeboxes if u not in self.tasks.index.by_uid]:
+                self.scheduler.cancel(self.timeboxes.pop(uid))  # its task was deleted remotely
+            self.hover = None
+            self._resize_for_tasks()
+        self.stats.apply_sync(deltas)
+        if changed or deltas:
+            self.sync.save_state()
 
     def _get_today_score(self) -> int:
         today = datetime.now().strftime("%Y-%m-%d")
         return self.stats.stats["daily_task_scores"].get(today, 0)
 
     def _wrap(self, text: str, width: int) -> List[str]:
-        """Wrap text while preserving newlines"""
+        """Wrap text while preserving newlines (cached until the next layout invalidation)"""
+        cached = self._wrap_cache.get((text, width))
+        if cached is not None:
+            return cached
         lines = []
         for line in text.split('\n'):
             words, cur = line.split(), ""
@@ -563,31 +1998,101 @@ class FocusApp:
                     cur = w
             if cur:
                 lines.append(cur)
-        return lines or [""]
+        lines = lines or [""]
+        self._wrap_cache[(text, width)] = lines
+        return lines
 
     def task_at(self, pos) -> int | None:
         """Task location"""
         y = 220
-        for i, t in enumerate(self.tasks.tasks):
-            row_h = max(28, len(self._wrap(t.text, self.screen.get_width()-150))*18)
+        for i, t in enumerate(self.visible_tasks()):
+            row_h = max(28, len(self._wrap(self._label(t), self.screen.get_width()-150))*18)
             if y <= pos[1] <= y + row_h:
                 return i
             y += row_h + self.task_padding
         return None
 
+    def visible_tasks(self) -> List[Task]:
+        """Tasks in the order currently shown (manual order or an indexed sort view)"""
+        if self.sort_view is None:
+            return self.tasks.tasks
+        return self.tasks.index.ordered(self.sort_view)
+
+    def _store_index(self, display_idx: int) -> int:
+        """Map a row on screen to its position in TaskStore.tasks"""
+        if self.sort_view is None:
+            return display_idx
+        return self.tasks.tasks.index(self.visible_tasks()[display_idx])
+
+    @staticmethod
+    def _label(task: Task) -> str:
+        """Task text as displayed, with priority marks and due date"""
+        label = f"{'!' * task.priority} {task.text}" if task.priority else task.text
+        return f"{label} (due {task.due})" if task.due else label
+
     def _resize_for_tasks(self) -> None:
+        """Invalidate task layout and resize the window to fit the list"""
+        self._wrap_cache.clear()
         new_h = max(BASE_H, min(1200, 260 + len(self.tasks.tasks)*40))
         pg.display.set_mode((self.screen.get_width(), new_h), pg.RESIZABLE)
 
+    def do(self, cmd: tuple, record: bool = True) -> None:
+        """Perform a task command: one journal append, plus its stats and layout effects"""
+        if cmd[0] == "remove":
+            if self.tasks.tasks[cmd[1]] is self.focus_task:
+                self.set_focus_task(None)
+            timer_id = self.timeboxes.pop(self.tasks.tasks[cmd[1]].uid, None)
+            if timer_id is not None:
+                self.scheduler.cancel(timer_id)
+        self.tasks.apply(cmd)
+        if cmd[0] == "toggle":
+            t = self.tasks.tasks[cmd[1]]
+            if t.complete:
+                self.stats.record_task_completion(t.score, save=False)
+            else:
+                self.stats.deduct_task_score(t.score, save=False)
+        elif cmd[0] != "move":
+            self._resize_for_tasks()
+        if record:
+            self.history.record(cmd)
+        if self.sync:
+            self.sync.flush()
+
+    def set_focus_task(self, task: Task | None) -> None:
+        """Change the active task, crediting time focused so far to the previous one"""
+        self._flush_task_focus()
+        self._pending_focus = 0.0
+        self.focus_task = task
+
+    def _flush_task_focus(self, save: bool = True) -> None:
+        """Move whole seconds of pending focus time into the active task's total"""
+        seconds = int(self._pending_focus)
+        if self.focus_task is not None and seconds:
+            self.stats.record_task_focus(self.focus_task.uid, seconds, save)
+            self._pending_focus -= seconds
+
+    def undo(self) -> None:
+        """Revert the last task command"""
+        if self.history.undo_stack:
+            cmd = self.history.undo_stack.pop()
+            self.do(History.inverse(cmd), record=False)
+            self.history.redo_stack.append(cmd)
+
+    def redo(self) -> None:
+        """Re-apply the last undone task command"""
+        if self.history.redo_stack:
+            cmd = self.history.redo_stack.pop()
+            self.do(cmd, record=False)
+            self.history.undo_stack.append(cmd)
+
     def edit_or_toggle(self, mouse) -> None:
         """Edit or tick the box depending on mouse location"""
         idx = self.hover
         if idx is None:
             return
-        t = self.tasks.tasks[idx]
         y = 220
-        for i, task in enumerate(self.tasks.tasks):
-            lines = self._wrap(task.text, self.screen.get_width()-150)
+        for i, task in enumerate(self.visible_tasks()):
+            lines = self._wrap(self._label(task), self.screen.get_width()-150)
             row_h = max(28, len(lines)*18)
             if i == idx:
                 # Place checkbox at top line of the task
@@ -595,49 +2100,44 @@ class FocusApp:
                 box_y = y
                 box = pg.Rect(30, box_y, box_size, box_size)
                 if box.collidepoint(mouse):
-                    if not t.complete:
-                        self.stats.record_task_completion(t.score)
-                    else:
-                        self.stats.deduct_task_score(t.score)
-                    t.complete ^= True
-                    self.tasks.save()
+                    self.do(("toggle", self._store_index(idx)))
                 return
             y += row_h + self.task_padding
 
     # Drawing functions
     def draw_splash(self) -> None:
-        """Splash screen"""
+        """Splash screen with warm-up progress"""
         self.screen.fill(COLOR_BG)
+        done, total = self.warmup.progress()
         lines = [
             "Pomodoro Technique","","25 minutes focused work","5 minute break","Repeat",
-            "","","","","","","Click anywhere to start"
+            "","","","","","","Click anywhere to start" if self.ready else f"Loading... {done}/{total}"
         ]
         y = 200
         for l in lines:
-            surf = self.font_m.render(l, True, COLOR_TEXT)
+            surf = MemoryProbe.track(self.splash_font.render(l, True, COLOR_TEXT))
             self.screen.blit(surf, (self.screen.get_width()//2 - surf.get_width()//2, y))
             y += 30
+        if not self.ready:
+            bar = pg.Rect(self.screen.get_width()//2 - 100, y + 10, 200, 6)
+            pg.draw.rect(self.screen, COLOR_BTN, bar)
+            pg.draw.rect(self.screen, COLOR_DONE, (bar.x, bar.y, bar.width * done // max(1, total), bar.height))
 
     def draw_main(self) -> None:
         """Draw main application"""
         self.screen.fill(COLOR_BG)
         self.btn_start.label = "Stop" if self.timer.running else "Start"
         mouse = pg.mouse.get_pos()
-        date_surf = self.font_s.render(
-            datetime.now().strftime("%A %d %B %Y %I:%M %p"),
-            True,
-            COLOR_TEXT
-            )
-        self.screen.blit(date_surf, (20, 20))
+        self.font_s.draw(self.screen, datetime.now().strftime("%A %d %B %Y %I:%M %p"), (20, 20), COLOR_TEXT)
 
         # Status and sessions
-        self.screen.blit(self.font_s.render(
-            f"Status: {self.timer.get_status()}", True, COLOR_DIM), (20, 40))
-        self.screen.blit(self.font_s.render(
-            f"Sessions Completed: {self.timer.sessions_completed}", True, COLOR_DIM), (20, 60))
-        self.screen.blit(self.font_s.render(
-            f"Today's Score: {self._get_today_score()}pts", True, COLOR_DONE),
-            (self.screen.get_width()-170, 60))
+        self.font_s.draw(self.screen, f"Status: {self.timer.get_status()}", (20, 40), COLOR_DIM)
+        self.font_s.draw(self.screen, f"Sessions Completed: {self.timer.sessions_completed}", (20, 60), COLOR_DIM)
+        self.font_s.draw(
+            self.screen, f"Today's Score: {self._get_today_score()}pts",
+            (self.screen.get_width()-170, 60), COLOR_DONE)
+        if self.notice and time.monotonic() < self.notice_until:
+            self.font_s.draw(self.screen, self.notice, (20, 80), COLOR_WARN)
 
         # Timer
         if self.timer.is_break:
@@ -646,8 +2146,9 @@ class FocusApp:
             color = COLOR_WARN
         else:
             color = COLOR_DONE
-        timer_surf = self.font_l.render(self.timer.display(), True, color)
-        self.screen.blit(timer_surf, (self.screen.get_width()-timer_surf.get_width()-20, 20))
+        timer_text = self.timer.display()
+        self.font_l.draw(
+            self.screen, timer_text, (self.screen.get_width()-self.font_l.size(timer_text)[0]-20, 20), color)
 
         # Buttons
         for b in (
@@ -660,11 +2161,21 @@ class FocusApp:
             ):
             b.draw(self.screen, self.font_s, mouse)
 
+        # Next task hint
+        if self.focus_task is not None:
+            spent = self.stats.stats["task_focus"].get(self.focus_task.uid, 0) + int(self._pending_focus)
+            hint = f"Focus on: {self.focus_task.text} ({spent // 60}m so far)"
+            hint = self._wrap(hint, self.screen.get_width() - 40)[0]
+            self.font_s.draw(self.screen, hint, (20, 150), COLOR_DONE)
+
         # Task header
-        self.screen.blit(self.font_m.render("Task List", True, COLOR_TEXT), (20, 180))
+        header = "Task List"
+        if self.sort_view is not None:
+            header += f" ({TaskIndex.LABELS[self.sort_view]})"
+        self.font_m.draw(self.screen, header, (20, 180), COLOR_TEXT)
         y = 220
-        for i, task in enumerate(self.tasks.tasks):
-            lines = self._wrap(task.text, self.screen.get_width()-150)
+        for i, task in enumerate(self.visible_tasks()):
+            lines = self._wrap(self._label(task), self.screen.get_width()-150)
             row_h = max(28, len(lines)*18)
             total_h = row_h + self.task_padding
 
@@ -677,10 +2188,14 @@ class FocusApp:
                     (20, y -4, self.screen.get_width()-85, row_h + extra_bottom)
                 )
 
+            # Active task marker
+            if task is self.focus_task:
+                pg.draw.rect(self.screen, COLOR_BREAK, (20, y - 4, 5, row_h + extra_bottom))
+
             # Dragging highlight (dimmed)
             if self.dragging_task == i:
                 extra_bottom = 4 if len(lines) > 1 else 0  # same as hover
-                surf = pg.Surface((self.screen.get_width()-85, row_h + extra_bottom), pg.SRCALPHA)
+                surf = MemoryProbe.track(pg.Surface((self.screen.get_width()-85, row_h + extra_bottom), pg.SRCALPHA))
                 surf.fill((70, 140, 80, 100))  # RGBA for dim
                 self.screen.blit(surf, (20, y - 4))   # match hover y offset
 
@@ -705,18 +2220,23 @@ class FocusApp:
             line_height = 18
             text_y = box_y + (box_size - line_height)//2
             for li, line in enumerate(lines):
-                surf = self.font_s.render(line, True, COLOR_DIM if task.complete else COLOR_TEXT)
-                self.screen.blit(surf, (60, text_y + li*line_height))
+                rect = self.font_s.draw(
+                    self.screen, line, (60, text_y + li*line_height), COLOR_DIM if task.complete else COLOR_TEXT)
                 if task.complete:
-                    ystrike = text_y + li*line_height + surf.get_height()//2 - 2
-                    pg.draw.line(self.screen, COLOR_DIM, (60, ystrike), (60+surf.get_width(), ystrike), 1)
+                    ystrike = text_y + li*line_height + self.font_s.get_height()//2 - 2
+                    pg.draw.line(self.screen, COLOR_DIM, (60, ystrike), (60+rect.width, ystrike), 1)
 
             # Task score
-            score_surf = self.font_s.render(
-                f"+{task.score}pts",
-                True, COLOR_DONE if task.complete else COLOR_DIM
-                )
-            self.screen.blit(score_surf, (self.screen.get_width()-60, text_y))
+            self.font_s.draw(
+                self.screen, f"+{task.score}pts",
+                (self.screen.get_width()-60, text_y), COLOR_DONE if task.complete else COLOR_DIM)
+
+            # Time box countdown
+            timer_id = self.timeboxes.get(task.uid)
+            if timer_id is not None:
+                m, s = divmod(int(self.scheduler.remaining(timer_id) or 0), 60)
+                self.font_s.draw(
+                    self.screen, f"{m:02}:{s:02}", (self.screen.get_width()-60, text_y + line_height), COLOR_BREAK)
             y += total_h
 
 
@@ -724,7 +2244,7 @@ class FocusApp:
         """Instructions screen"""
         self.screen.fill(COLOR_BG)
         self.btn_back.draw(self.screen, self.font_s, pg.mouse.get_pos())
-        self.screen.blit(self.font_m.render("How to Use Focus Flow", True, COLOR_TEXT), (20, 20))
+        self.font_m.draw(self.screen, "How to Use Focus Flow", (20, 20), COLOR_TEXT)
         instructions = [
             "App Overview:", "• Focus Flow combines Pomodoro Technique with a to-do list",
             "• Designed to help manage your time and tasks effectively", "", "Timer:",
@@ -732,28 +2252,33 @@ class FocusApp:
             "• Click 'Custom Timer' to set custom durations", "", "Tasks:",
             "• Click 'Add Task' to create a new task",
             "• Click and drag to re-arrange task order",
+            "• Press S to cycle sorting: manual, due date, points, incomplete first",
+            "• Hover a task and press F to make it the active task (tracks focus time)",
             "• Click checkbox to mark task complete (earn points/xp!)",
             "• Double click task text to edit it (and to adjust points)",
-            "• Right-click task to delete it","• CTRL + Z to undo task deletion", "", "Scoring:",
+            "• Right-click task to delete it",
+            "• CTRL + Z to undo, CTRL + SHIFT + Z to redo (add/edit/tick/move/delete)",
+            "• Hover a task and press T to start/cancel a time box for it",
+            "• CTRL + I to import tasks from a .md checklist, .csv or .txt file", "", "Scoring:",
             "• Each task has a point value (default 10 pts)",
             "• Earn points when you complete tasks",
             "• Lose points when you untick completed tasks",
             "• Track daily scores on the Statistics page", "", "Sessions:",
             "• 25 mins focus, 5 mins break (standard or set custom times)",
-            "• After 4 sessions, take a 30 min break","• Track your progress in Stats!",
+            f"• After {self.cycle.long_break_every} sessions, take a {self.cycle.long_break_minutes} min break",
+            "• Track your progress in Stats!",
         ]
         y = 60
         for line in instructions:
             color = COLOR_DIM if line.startswith("•") else COLOR_TEXT
-            surf = self.font_s.render(line, True, color if line else COLOR_DIM)
-            self.screen.blit(surf, (20, y))
+            self.font_s.draw(self.screen, line, (20, y), color if line else COLOR_DIM)
             y += 22
 
     def draw_stats(self) -> None:
         """Stats screen"""
         self.screen.fill(COLOR_BG)
         self.btn_back.draw(self.screen, self.font_s, pg.mouse.get_pos())
-        self.screen.blit(self.font_m.render("Your Statistics", True, COLOR_TEXT), (20, 20))
+        self.font_m.draw(self.screen, "Your Statistics", (20, 20), COLOR_TEXT)
         total_hours, total_mins = divmod(self.stats.stats["total_focus_time"], 3600)
         total_mins //= 60
         stats_lines = [
@@ -775,32 +2300,96 @@ class FocusApp:
         y = 50
         for line in stats_lines:
             color = COLOR_DIM if line.startswith(" ") else COLOR_TEXT
-            self.screen.blit(self.font_s.render(line, True, color), (20, y))
+            self.font_s.draw(self.screen, line, (20, y), color)
             y += 25
 
+        # Per-task focus time, served from the per-task totals (rebuilt only when stats or tasks change)
+        report_key = (self.stats.version, self.tasks.version)
+        if self._task_report[0] != report_key:
+            report = []
+            for uid, seconds in self.stats.top_task_focus(5):
+                task = self.tasks.index.by_uid.get(uid)
+                name = task.text.split("\n")[0] if task else "(deleted task)"
+                report.append(f"  {seconds // 3600}h {seconds % 3600 // 60:02}m  {name}")
+            self._task_report = (report_key, report)
+        if self._task_report[1]:
+            self.font_s.draw(self.screen, "Focus Time by Task:", (20, y), COLOR_TEXT)
+            y += 25
+            for line in self._task_report[1]:
+                line = self._wrap(line, self.screen.get_width() - 40)[0]
+                self.font_s.draw(self.screen, line, (20, y), COLOR_DIM)
+                y += 20
+
+        # Charts are rendered off-thread; only blit whatever is ready
+        chart_size = (self.screen.get_width() - 40, max(160, self.screen.get_height() - y - 20))
+        chart = self.charts.get(self.stats, chart_size)
+        if chart is not None:
+            self.screen.blit(chart, (20, y + 10))
+        else:
+            self.font_s.draw(self.screen, "Rendering charts...", (20, y + 10), COLOR_DIM)
+
     def run(self) -> None:
         """Main loop"""
+        work_start = None
         while True:
+            if work_start is not None:
+                # Time the frame's work only: tick() sleeps to cap the frame rate
+                METRICS.frame_seconds.observe(time.perf_counter() - work_start)
             dt = self.clock.tick(FPS)/1000
+            work_start = time.perf_counter()
+            if not self.ready and self.warmup.done():
+                self._finish_warmup()
             for e in pg.event.get():
                 if e.type == pg.QUIT:
+                    if not self.ready:
+                        return  # nothing loaded yet, so nothing to save
+                    self._flush_task_focus(save=False)
                     self.tasks.save()
                     self.stats.save()
+                    if self.sync:
+                        self.sync.flush()
+                        self.sync.save_state()
+                    if self.memory_probe:
+                        self.memory_probe.snapshot()
+                    if self.exporter:
+                        self.exporter.stop()
                     return
 
                 if e.type == pg.VIDEORESIZE:
                     if e.w < BASE_W or e.h < BASE_H:
                         pg.display.set_mode((BASE_W, BASE_H), pg.RESIZABLE)
 
-                if self.mode == AppMode.SPLASH and e.type == pg.MOUSEBUTTONDOWN:
-                    self.mode = AppMode.MAIN
+                if self.mode == AppMode.SPLASH:
+                    if e.type == pg.MOUSEBUTTONDOWN and self.ready:
+                        self.mode = AppMode.MAIN
                     continue
 
                 if e.type == pg.KEYDOWN and e.key == pg.K_z and pg.key.get_mods() & pg.KMOD_CTRL:
-                    if self._undo_cache:
-                        self.tasks.tasks.append(self._undo_cache.pop())
-                        self.tasks.save()
-                        self._resize_for_tasks()
+                    if pg.key.get_mods() & pg.KMOD_SHIFT:
+                        self.redo()
+                    else:
+                        self.undo()
+
+                if e.type == pg.KEYDOWN and e.key == pg.K_i and pg.key.get_mods() & pg.KMOD_CTRL and self.mode == AppMode.MAIN:
+                    path = threaded_dialog(Dialogs.import_path)
+                    if path:
+                        try:
+                            if self.tasks.bulk_import(path):
+                                self._resize_for_tasks()
+                        except (OSError, ValueError, csv.Error) as err:  # ValueError covers UnicodeDecodeError
+                            print(f"Failed to import tasks: {err}")
+
+                if e.type == pg.KEYDOWN and e.key == pg.K_s and self.mode == AppMode.MAIN:
+                    pos = self.sort_views.index(self.sort_view)
+                    self.sort_view = self.sort_views[(pos + 1) % len(self.sort_views)]
+                    self.hover = None
+
+                if e.type == pg.KEYDOWN and e.key == pg.K_f and self.hover is not None and self.mode == AppMode.MAIN:
+                    task = self.visible_tasks()[self.hover]
+                    self.set_focus_task(None if task is self.focus_task else task)
+
+                if e.type == pg.KEYDOWN and e.key == pg.K_t and self.hover is not None and self.mode == AppMode.MAIN:
+                    self.toggle_timebox(self.hover)
 
                 if e.type == pg.MOUSEMOTION:
                     self.hover = self.task_at(e.pos) if self.mode == AppMode.MAIN else None
@@ -821,15 +2410,15 @@ class FocusApp:
 
                     if idx is not None:
                         if self.last_click_pos == idx and now - self.last_click_time <= self.double_click_threshold:
-                            t = self.tasks.tasks[idx]
-                            res = threaded_dialog(Dialogs.multiline_task_with_score, initial_text=t.text, initial_score=t.score)
+                            t = self.visible_tasks()[idx]
+                            res = threaded_dialog(
+                                Dialogs.multiline_task_with_score, initial_text=t.text, initial_score=t.score,
+                                initial_due=t.due, initial_priority=t.priority)
 
                             if res:
-                                txt, score = res
-                                t.text = txt
-                                t.score = score
-                                self.tasks.save()
-                                self._resize_for_tasks()
+                                new = dict(zip(("text", "score", "due", "priority"), res))
+                                old = {k: getattr(t, k) for k in new}
+                                self.do(("update", self._store_index(idx), old, new))
                                 self.dragging_task = None
                                 self.mouse_down_pos = None
 
@@ -853,6 +2442,8 @@ class FocusApp:
                             if self.timer.running:
                                 self.timer.stop()
                             else:
+                                if not self.timer.is_break and self.focus_task is None:
+                                    self.set_focus_task(self.tasks.index.next_task())
                                 self.timer.start()
 
                         elif self.btn_custom.rect.collidepoint(e.pos):
@@ -870,10 +2461,9 @@ class FocusApp:
                         elif self.btn_add.rect.collidepoint(e.pos):
                             res = threaded_dialog(Dialogs.multiline_task_with_score)
                             if res:
-                                txt, score = res
-                                self.tasks.tasks.append(Task(text=txt, score=score))
-                                self.tasks.save()
-                                self._resize_for_tasks()
+                                txt, score, due, priority = res
+                                task = Task(text=txt, score=score, due=due, priority=priority)
+                                self.do(("insert", len(self.tasks.tasks)) + astuple(task))
 
                         elif self.btn_instructions.rect.collidepoint(e.pos):
                             self.mode=AppMode.INSTRUCTIONS
@@ -888,10 +2478,9 @@ class FocusApp:
 
                 if e.type==pg.MOUSEBUTTONUP and e.button==1:
                     idx = self.task_at(e.pos)
-                    if self.dragging_task is not None and idx is not None and self.dragging_task != idx:
-                        task_to_move = self.tasks.tasks.pop(self.dragging_task)
-                        self.tasks.tasks.insert(idx, task_to_move)
-                        self.tasks.save()
+                    if (self.dragging_task is not None and idx is not None and self.dragging_task != idx
+                            and self.sort_view is None):
+                        self.do(("move", self.dragging_task, idx))
 
                         self.dragging_task = None
                         self.mouse_down_pos = None
@@ -903,17 +2492,21 @@ class FocusApp:
 
                 if e.type==pg.MOUSEBUTTONDOWN and e.button==3 and self.hover is not None and self.mode==AppMode.MAIN:
                     if threaded_dialog(Dialogs.confirm_delete):
-                        self._undo_cache.append(self.tasks.tasks.pop(self.hover))
-                        if len(self._undo_cache) > 20:
-                            self._undo_cache.pop(0)
-                        self.tasks.save()
-                        self._resize_for_tasks()
+                        store_idx = self._store_index(self.hover)
+                        self.do(("remove", store_idx) + astuple(self.tasks.tasks[store_idx]))
+
+            # Scheduled timers (time boxes, reminders) - only the earliest deadline is checked
+            self._handle_fired_timers()
 
             # Timer update
+            if self.mode==AppMode.MAIN and self.timer.running and not self.timer.is_break:
+                self._pending_focus += min(dt, self.timer.remaining)
             if self.mode==AppMode.MAIN and self.timer.update(dt):
                 self._play_alarm()
                 threaded_dialog(Dialogs.finished)
                 pg.mixer.stop()
+                if not self.timer.is_break:
+                    self._flush_task_focus(save=False)  # saved by record_session
                 self.stats.record_session(int(self.timer.total))  # Record session length
 
                 if self.timer.is_break:
@@ -932,4 +2525,9 @@ class FocusApp:
             pg.display.flip()
 
 if __name__ == "__main__":
-    FocusApp().run()
\ No newline at end of file
+    if "--build-pack" in sys.argv:
+        print(f"Packed {AssetPack.build('media', PACK_NAME)} assets into {PACK_NAME}")
+    elif "--bench-text" in sys.argv:
+        bench_text()
+    else:
+        FocusApp().run()
\ No newline at end of file
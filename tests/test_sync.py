@@ -0,0 +1,96 @@
+from FocusFlow import SyncLog, Task
+
+
+def device_pair(tmp_path):
+    sync_dir = str(tmp_path / "sync")
+    return SyncLog(sync_dir, "A"), SyncLog(sync_dir, "B")
+
+
+def exchange(*logs):
+    for log in logs:
+        log.flush()
+    for log in logs:
+        log.merge()
+
+
+def shared_task(a, b, text="write report"):
+    task = Task(text)
+    a.record_task(task)
+    a.set(task.uid, "order", 1.0)
+    exchange(a, b)
+    return task.uid
+
+
+def test_concurrent_edits_to_different_fields_both_survive(tmp_path):
+    a, b = device_pair(tmp_path)
+    uid = shared_task(a, b)
+    a.set(uid, "complete", True)
+    b.set(uid, "text", "write the report")
+    exchange(a, b)
+    assert a.values[uid] == b.values[uid]
+    assert a.values[uid]["complete"] is True
+    assert a.values[uid]["text"] == "write the report"
+
+
+def test_same_field_conflict_resolves_identically(tmp_path):
+    a, b = device_pair(tmp_path)
+    uid = shared_task(a, b)
+    a.set(uid, "text", "from A")
+    b.set(uid, "text", "from B")
+    exchange(a, b)
+    assert a.values[uid]["text"] == b.values[uid]["text"] == "from B"  # equal lamport: device id breaks the tie
+
+
+def test_delete_wins_over_concurrent_edit(tmp_path):
+    a, b = device_pair(tmp_path)
+    uid = shared_task(a, b)
+    a.set(uid, "deleted", True)
+    b.set(uid, "text", "edited elsewhere")
+    exchange(a, b)
+    assert a.values[uid] == b.values[uid]
+    assert uid not in a.live_order() and uid not in b.live_order()
+
+
+def test_record_order_only_rekeys_moved_task(tmp_path):
+    a, _ = device_pair(tmp_path)
+    uids = []
+    for text in ("one", "two", "three"):
+        task = Task(text)
+        a.record_task(task)
+        uids.append(task.uid)
+    a.record_order(uids)
+    a.flush()
+    a.record_order(uids[1:] + uids[:1])
+    assert len(a._outbox) == 1
+    assert a.live_order() == uids[1:] + uids[:1]
+
+
+def test_snapshot_resume_does_not_double_count(tmp_path, workdir):
+    a, b = device_pair(tmp_path)
+    a.merge(include_own=True)
+    a.inc("score", "2026-01-01", 5)
+    a.flush()
+    a.save_state()
+    a.inc("score", "2026-01-01", 1)
+    a.save_state()  # snapshot taken with this op still queued...
+    a.flush()       # ...then written, then the app dies before the next snapshot
+    a.inc("score", "2026-01-01", 2)
+    a.flush()
+    b.inc("score", "2026-01-01", 100)
+    b.flush()
+
+    resumed = SyncLog.load(a.dir, "A")
+    assert resumed._outbox == []
+    resumed.merge(include_own=True)
+    replayed = SyncLog(a.dir, "A")
+    replayed.merge(include_own=True)
+    assert resumed.counters == replayed.counters == {("score", "2026-01-01"): 108}
+
+
+def test_snapshot_for_another_folder_is_ignored(tmp_path, workdir):
+    a, _ = device_pair(tmp_path)
+    a.inc("score", "2026-01-01", 3)
+    a.flush()
+    a.save_state()
+    other = SyncLog.load(str(tmp_path / "elsewhere"), "A")
+    assert other.counters == {} and other.offsets == {}
@@ -0,0 +1,95 @@
+from dataclasses import astuple
+
+import FocusFlow
+from FocusFlow import History, Task, TaskIndex, TaskStore
+
+
+def run(store, history, cmd):
+    store.apply(cmd)
+    history.record(cmd)
+
+
+def undo(store, history):
+    cmd = history.undo_stack.pop()
+    store.apply(History.inverse(cmd))
+    history.redo_stack.append(cmd)
+
+
+def redo(store, history):
+    cmd = history.redo_stack.pop()
+    store.apply(cmd)
+    history.undo_stack.append(cmd)
+
+
+def edit_session(store):
+    history = History()
+    run(store, history, ("insert", 0, *astuple(Task("a", score=5))))
+    run(store, history, ("insert", 1, *astuple(Task("b"))))
+    run(store, history, ("insert", 2, *astuple(Task("c"))))
+    run(store, history, ("toggle", 0))
+    run(store, history, ("update", 1, {"text": "b"}, {"text": "b2"}))
+    run(store, history, ("move", 0, 2))
+    run(store, history, ("remove", 0, *astuple(store.tasks[0])))
+    undo(store, history)
+    undo(store, history)
+    redo(store, history)
+    return history
+
+
+def test_journal_replay_matches_after_undo_redo(workdir):
+    store = TaskStore()
+    store.load()
+    edit_session(store)
+    reloaded = TaskStore()
+    reloaded.load()
+    assert [astuple(t) for t in reloaded.tasks] == [astuple(t) for t in store.tasks]
+    assert [t.text for t in store.tasks] == ["b2", "c", "a"]
+
+
+def test_journal_replay_across_compaction(workdir, monkeypatch):
+    monkeypatch.setattr(FocusFlow, "JOURNAL_COMPACT", 3)
+    store = TaskStore()
+    store.load()
+    edit_session(store)
+    reloaded = TaskStore()
+    reloaded.load()
+    assert [astuple(t) for t in reloaded.tasks] == [astuple(t) for t in store.tasks]
+
+
+def test_stale_journal_entries_are_ignored(workdir):
+    store = TaskStore()
+    store.load()
+    store.apply(("insert", 0, *astuple(Task("kept"))))
+    store.save()
+    with open(FocusFlow.JOURNAL_PATH, "w", encoding="utf-8") as f:
+        f.write('{"g": 0, "cmd": ["toggle", 0]}\n')  # from before the save
+    reloaded = TaskStore()
+    reloaded.load()
+    assert [(t.text, t.complete) for t in reloaded.tasks] == [("kept", False)]
+
+
+def test_index_views_follow_incremental_changes():
+    tasks = [Task("low", score=1, due="2026-02-01"), Task("high", score=9), Task("soon", due="2026-01-01")]
+    index = TaskIndex()
+    index.rebuild(tasks)
+    assert [t.text for t in index.ordered("due")] == ["soon", "low", "high"]
+    assert [t.text for t in index.ordered("score")] == ["soon", "high", "low"]
+    tasks[2].complete = True
+    index.refresh(tasks[2])
+    assert index.next_task() is tasks[0]
+    index.discard(tasks[0])
+    assert index.next_task() is tasks[1]
+    fresh = TaskIndex()
+    fresh.rebuild([tasks[1], tasks[2]])
+    assert fresh.views == index.views
+
+
+def test_save_tolerates_a_vanished_journal(workdir):
+    store = TaskStore()
+    store.load()
+    store.apply(("insert", 0, *astuple(Task("a"))))
+    (workdir / FocusFlow.JOURNAL_PATH).unlink()
+    store.save()
+    reloaded = TaskStore()
+    reloaded.load()
+    assert [t.text for t in reloaded.tasks] == ["a"]